@@ -3,6 +3,7 @@ from mysql.connector import Error
 import logging
 import hashlib
 from datetime import datetime
+from inventory_management_product_table import ProductTable
 
 # Set up logging
 logging.basicConfig(
@@ -12,8 +13,17 @@ logging.basicConfig(
 )
 
 class InventoryManagementSystem:
-    def __init__(self):
-        """Initialize connection to the MySQL database."""
+    def __init__(self, connection=None):
+        """Initialize connection to the MySQL database.
+
+        An already open DB-API connection may be passed instead, e.g. the
+        local stand-in database used by the load simulator.
+        """
+        if connection is not None:
+            self.connection = connection
+            logging.info("Using provided database connection")
+            self._initialize_default_users()
+            return
         try:
             self.connection = mysql.connector.connect(
                 host="localhost",
@@ -136,6 +146,26 @@ class InventoryManagementSystem:
             logging.error(f"Error retrieving inventory: {e}")
             return []
 
+    def view_inventory_table(self):
+        """Retrieve all products in the inventory as a columnar ProductTable."""
+        if not self._check_connection():
+            return ProductTable()
+        try:
+            cursor = self.connection.cursor()
+            query = "SELECT id, name, category, price, quantity FROM products"
+            cursor.execute(query)
+            # Fetch everything first so a bad row cannot leave unread results
+            # on the connection, and so the id index is sized only once.
+            table = ProductTable.from_rows(cursor.fetchall())
+            logging.info(f"Inventory table retrieved successfully: {len(table)} products")
+            return table
+        except Error as e:
+            logging.error(f"Error retrieving inventory table: {e}")
+            return ProductTable()
+        except (TypeError, ValueError) as e:
+            logging.error(f"Invalid product row in inventory table: {e}")
+            return ProductTable()
+
     def update_product(self, product_id, name=None, category=None, price=None, quantity=None):
         """Update product details."""
         if not self._check_connection():
@@ -0,0 +1,448 @@
+"""Concurrent checkout load simulator.
+
+Runs many simulated cashier sessions against a local SQLite stand-in for the
+MySQL database, driving the real InventoryManagementSystem.record_sale flow,
+and reports throughput, latency percentiles, lock errors/retries and final
+stock consistency. Runs are seedable so the same basket mix can be replayed
+before every release:
+
+    python inventory_management_load_simulator.py --cashiers 16 --seed 42
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from mysql.connector import errors
+from Inventory_management_backend import InventoryManagementSystem
+
+# MySQL error codes the stand-in reports for SQLite lock failures.
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+LOCK_ERRNOS = (ER_LOCK_WAIT_TIMEOUT, ER_LOCK_DEADLOCK)
+
+SIM_PASSWORD = "sim-123456"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL UNIQUE,
+    password_hash TEXT NOT NULL,
+    role TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    price REAL NOT NULL,
+    quantity INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sales (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    invoice_number TEXT NOT NULL,
+    product_id INTEGER NOT NULL REFERENCES products(id),
+    quantity INTEGER NOT NULL,
+    total_price REAL NOT NULL,
+    sale_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    cashier_username TEXT NOT NULL
+);
+"""
+
+
+class StandInCursor:
+    """Cursor that accepts MySQL-style %s placeholders and raises mysql.connector errors."""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._cursor = connection.raw.cursor()
+
+    def execute(self, query, params=()):
+        self._connection.call(self._cursor.execute, query.replace("%s", "?"), tuple(params))
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+
+class StandInConnection:
+    """Minimal mysql.connector-like connection over a SQLite database file.
+
+    The last error raised by any cursor is kept in last_error, since the
+    backend logs and swallows errors instead of re-raising them.
+    """
+
+    def __init__(self, db_path, lock_timeout=1.0):
+        self.raw = sqlite3.connect(db_path, timeout=lock_timeout)
+        self.lock_timeout = lock_timeout
+        self.last_error = None
+
+    def call(self, method, *args):
+        """Run a SQLite call, re-raising its errors as mysql.connector errors.
+
+        SQLite skips the busy timeout and fails at once when waiting could
+        never succeed, i.e. when two transactions deadlock on lock upgrades.
+        A busy error from inside a transaction that came back well before
+        the timeout is therefore reported as a deadlock.
+        """
+        in_transaction = self.raw.in_transaction
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        except sqlite3.Error as e:
+            waited = time.perf_counter() - started
+            deadlock = in_transaction and waited < self.lock_timeout / 2
+            error = _to_mysql_error(e, deadlock)
+            self.last_error = error
+            raise error from e
+
+    def is_connected(self):
+        return True
+
+    def cursor(self):
+        return StandInCursor(self)
+
+    def commit(self):
+        self.call(self.raw.commit)
+
+    def rollback(self):
+        self.call(self.raw.rollback)
+
+    def close(self):
+        self.raw.close()
+
+
+def _to_mysql_error(error, deadlock=False):
+    """Map a SQLite error to the closest mysql.connector error."""
+    message = str(error)
+    if isinstance(error, sqlite3.OperationalError) and re.search(r"locked|busy", message):
+        errno = ER_LOCK_DEADLOCK if deadlock else ER_LOCK_WAIT_TIMEOUT
+        return errors.DatabaseError(msg=message, errno=errno)
+    if isinstance(error, sqlite3.IntegrityError):
+        return errors.IntegrityError(msg=message)
+    return errors.DatabaseError(msg=message)
+
+
+def create_standin_db(db_path, num_products, initial_stock, num_cashiers, rng):
+    """Create and seed the stand-in database, returning the initial stock per product."""
+    raw = sqlite3.connect(db_path)
+    raw.executescript(SCHEMA)
+    raw.close()
+
+    connection = StandInConnection(db_path)
+    ims = InventoryManagementSystem(connection=connection)
+    for i in range(num_products):
+        price = round(rng.uniform(0.5, 50.0), 2)
+        ims.add_product(f"SIM Product {i + 1}", f"Category {i % 10}", price, initial_stock)
+    for i in range(num_cashiers):
+        ims.add_cashier(f"SIM-CASHIER-{i + 1}", SIM_PASSWORD)
+
+    cursor = connection.cursor()
+    cursor.execute("SELECT id, price, quantity FROM products ORDER BY id")
+    rows = cursor.fetchall()
+    ims.close_connection()
+    return {product_id: (price, quantity) for product_id, price, quantity in rows}
+
+
+def percentile(sorted_values, pct):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class CashierSession(threading.Thread):
+    """One simulated till: logs in and rings up baskets until the run ends."""
+
+    def __init__(self, index, config, product_ids, start_barrier):
+        super().__init__(name=f"cashier-{index}")
+        self.username = f"SIM-CASHIER-{index}"
+        self.config = config
+        self.product_ids = product_ids
+        self.start_barrier = start_barrier
+        self.rng = random.Random(config.seed * 1000003 + index)
+
+        hot_count = max(1, int(len(product_ids) * config.hot_fraction))
+        self.hot_ids = product_ids[:hot_count]
+        self.cold_ids = product_ids[hot_count:] or self.hot_ids
+
+        self.logged_in = False
+        self.baskets = 0
+        self.sales = 0
+        self.rejected = 0
+        self.lock_errors = 0
+        self.deadlocks = 0
+        self.retries = 0
+        self.failed = 0
+        self.other_errors = 0
+        self.crash = None
+        self.latencies = []
+
+    def _pick_product(self):
+        if self.rng.random() < self.config.hot_share:
+            return self.rng.choice(self.hot_ids)
+        return self.rng.choice(self.cold_ids)
+
+    def _ring_up(self, ims, invoice_number, product_id, quantity):
+        """Look up and record one basket line, retrying on lock errors."""
+        connection = ims.connection
+        for attempt in range(self.config.max_retries + 1):
+            connection.last_error = None
+            started = time.perf_counter()
+            recorded = False
+            try:
+                product = ims.get_product(product_id)
+                if product:
+                    total_price = round(float(product[3]) * quantity, 2)
+                    recorded = ims.record_sale(invoice_number, product_id, quantity,
+                                               total_price, self.username)
+            except errors.Error as e:
+                # e.g. the rollback in record_sale's own error handler failed
+                logging.error(f"Unhandled database error for {self.username}: {e}")
+            self.latencies.append(time.perf_counter() - started)
+            if recorded:
+                self.sales += 1
+                return
+            error = connection.last_error
+            if error is None:
+                # record_sale rejected the line, i.e. insufficient stock
+                self.rejected += 1
+                return
+            if error.errno not in LOCK_ERRNOS:
+                self.other_errors += 1
+                return
+            self.lock_errors += 1
+            if error.errno == ER_LOCK_DEADLOCK:
+                self.deadlocks += 1
+            if attempt < self.config.max_retries:
+                self.retries += 1
+                time.sleep(self.rng.uniform(0, self.config.retry_backoff * (2 ** attempt)))
+        self.failed += 1
+
+    def run(self):
+        ims = None
+        try:
+            try:
+                connection = StandInConnection(self.config.db_path, self.config.lock_timeout)
+                ims = InventoryManagementSystem(connection=connection)
+                self.logged_in = ims.authenticate_user(self.username, SIM_PASSWORD) == 'cashier'
+                if not self.logged_in:
+                    logging.error(f"Simulated cashier {self.username} failed to log in")
+            finally:
+                # Every session reaches the barrier so the clock starts only
+                # once all logins are done, successful or not.
+                self.start_barrier.wait()
+            if self.logged_in:
+                self._ring_up_baskets(ims)
+        except Exception as e:
+            self.crash = repr(e)
+            logging.exception(f"Simulated cashier {self.username} crashed")
+        finally:
+            if ims:
+                ims.close_connection()
+
+    def _ring_up_baskets(self, ims):
+        deadline = time.perf_counter() + self.config.duration
+        while self.baskets < self.config.baskets and time.perf_counter() < deadline:
+            self.baskets += 1
+            invoice_number = f"SIM-{self.config.seed}-{self.username}-{self.baskets}"
+            basket_size = self.rng.randint(1, self.config.max_basket_size)
+            for _ in range(basket_size):
+                quantity = self.rng.randint(1, self.config.max_line_quantity)
+                self._ring_up(ims, invoice_number, self._pick_product(), quantity)
+            if self.config.think_time:
+                time.sleep(self.rng.uniform(0, self.config.think_time))
+
+
+def check_consistency(db_path, initial_stock):
+    """Compare final stock with initial stock minus recorded sales."""
+    raw = sqlite3.connect(db_path)
+    try:
+        sold = dict(raw.execute(
+            "SELECT product_id, SUM(quantity) FROM sales GROUP BY product_id"
+        ).fetchall())
+        final = dict(raw.execute("SELECT id, quantity FROM products").fetchall())
+        sales_rows = raw.execute("SELECT COUNT(*) FROM sales").fetchone()[0]
+    finally:
+        raw.close()
+
+    oversold = sorted(pid for pid, quantity in final.items() if quantity < 0)
+    mismatched = sorted(
+        pid for pid, (_, initial) in initial_stock.items()
+        if initial - sold.get(pid, 0) != final.get(pid)
+    )
+    return {
+        "sales_rows": sales_rows,
+        "units_sold": sum(sold.values()),
+        "oversold_products": oversold,
+        "oversold_units": -sum(final[pid] for pid in oversold),
+        "mismatched_products": mismatched,
+    }
+
+
+def run_simulation(config):
+    """Run one simulation and return its report as a dict."""
+    rng = random.Random(config.seed)
+    initial_stock = create_standin_db(config.db_path, config.products,
+                                      config.initial_stock, config.cashiers, rng)
+    product_ids = list(initial_stock)
+    rng.shuffle(product_ids)
+
+    start_barrier = threading.Barrier(config.cashiers + 1)
+    sessions = [
+        CashierSession(i + 1, config, product_ids, start_barrier)
+        for i in range(config.cashiers)
+    ]
+    for session in sessions:
+        session.start()
+    start_barrier.wait()
+    started = time.perf_counter()
+    for session in sessions:
+        session.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(l for session in sessions for l in session.latencies)
+    totals = {
+        key: sum(getattr(session, key) for session in sessions)
+        for key in ("baskets", "sales", "rejected", "lock_errors", "deadlocks",
+                    "retries", "failed", "other_errors")
+    }
+    consistency = check_consistency(config.db_path, initial_stock)
+    consistency["ok"] = (
+        not consistency["oversold_products"]
+        and not consistency["mismatched_products"]
+        and consistency["sales_rows"] == totals["sales"]
+    )
+    crashes = {session.username: session.crash for session in sessions if session.crash}
+    logged_in = sum(session.logged_in for session in sessions)
+    return {
+        "ok": consistency["ok"] and not crashes and logged_in == config.cashiers,
+        "seed": config.seed,
+        "cashiers": config.cashiers,
+        "cashiers_logged_in": logged_in,
+        "crashed_sessions": crashes,
+        "elapsed_seconds": round(elapsed, 3),
+        **totals,
+        "sales_per_second": round(totals["sales"] / elapsed, 2) if elapsed else 0.0,
+        "baskets_per_second": round(totals["baskets"] / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            name: round(percentile(latencies, pct) * 1000, 3)
+            for name, pct in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+        },
+        "consistency": consistency,
+    }
+
+
+def format_report(report):
+    """Render a report as plain text."""
+    latency = report["latency_ms"]
+    consistency = report["consistency"]
+    lines = [
+        f"Seed:               {report['seed']}",
+        f"Cashiers:           {report['cashiers_logged_in']}/{report['cashiers']} logged in",
+        f"Crashed sessions:   {len(report['crashed_sessions'])}",
+        f"Elapsed:            {report['elapsed_seconds']} s",
+        f"Baskets:            {report['baskets']} ({report['baskets_per_second']}/s)",
+        f"Sales recorded:     {report['sales']} ({report['sales_per_second']}/s)",
+        f"Rejected (stock):   {report['rejected']}",
+        f"Lock errors:        {report['lock_errors']} (deadlocks: {report['deadlocks']})",
+        f"Retries:            {report['retries']}",
+        f"Failed after retry: {report['failed']}",
+        f"Other errors:       {report['other_errors']}",
+        f"Latency (ms):       p50 {latency['p50']}  p90 {latency['p90']}  "
+        f"p99 {latency['p99']}  max {latency['max']}",
+        f"Units sold:         {consistency['units_sold']}",
+        f"Oversold products:  {len(consistency['oversold_products'])} "
+        f"({consistency['oversold_units']} units)",
+        f"Stock mismatches:   {len(consistency['mismatched_products'])}",
+        f"Consistency:        {'OK' if consistency['ok'] else 'FAILED'}",
+    ]
+    for username, crash in report["crashed_sessions"].items():
+        lines.append(f"  {username} crashed: {crash}")
+    lines.append(f"Result:             {'OK' if report['ok'] else 'FAILED'}")
+    return "\n".join(lines)
+
+
+def configure_logging(log_file=None):
+    """Keep simulated sales out of the application's log file.
+
+    Importing the backend points the root logger at inventory_management.log
+    at DEBUG level, which would append a line per simulated sale and make
+    every session wait on one file lock. Logging is dropped unless a
+    simulator log file is given.
+    """
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    if log_file:
+        handler = logging.FileHandler(log_file)
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(threadName)s - %(levelname)s - %(message)s'
+        ))
+        root.addHandler(handler)
+        root.setLevel(logging.DEBUG)
+    else:
+        root.addHandler(logging.NullHandler())
+        root.setLevel(logging.CRITICAL + 1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent checkouts against a local stand-in database.")
+    parser.add_argument("--cashiers", type=int, default=8, help="number of concurrent cashier sessions")
+    parser.add_argument("--baskets", type=int, default=200, help="baskets per cashier")
+    parser.add_argument("--duration", type=float, default=60.0, help="maximum run time in seconds")
+    parser.add_argument("--products", type=int, default=200, help="number of products to seed")
+    parser.add_argument("--initial-stock", type=int, default=100, help="starting quantity per product")
+    parser.add_argument("--hot-fraction", type=float, default=0.05, help="fraction of products that are hot SKUs")
+    parser.add_argument("--hot-share", type=float, default=0.6, help="share of basket lines that hit hot SKUs")
+    parser.add_argument("--max-basket-size", type=int, default=5, help="maximum lines per basket")
+    parser.add_argument("--max-line-quantity", type=int, default=3, help="maximum units per basket line")
+    parser.add_argument("--think-time", type=float, default=0.0, help="maximum pause between baskets in seconds")
+    parser.add_argument("--lock-timeout", type=float, default=1.0, help="seconds to wait on a locked database")
+    parser.add_argument("--max-retries", type=int, default=3, help="retries for a sale that hit a lock error")
+    parser.add_argument("--retry-backoff", type=float, default=0.01, help="base retry backoff in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the basket mix")
+    parser.add_argument("--db-path", help="stand-in database file (default: temporary file)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--log-file", help="write backend and simulator logs here (counted in timings)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    config = parse_args(argv)
+    configure_logging(config.log_file)
+    temp_dir = None
+    if not config.db_path:
+        temp_dir = tempfile.TemporaryDirectory()
+        config.db_path = os.path.join(temp_dir.name, "inventory_sim.db")
+    elif os.path.exists(config.db_path):
+        sys.exit(f"Refusing to reuse existing database {config.db_path}")
+    try:
+        report = run_simulation(config)
+    finally:
+        if temp_dir:
+            temp_dir.cleanup()
+    print(json.dumps(report, indent=2) if config.json else format_report(report))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+from array import array
+import logging
+import operator
+import sys
+
+# Row indexes handed out by filter/sort are unsigned 32-bit ints, which is
+# plenty for any catalog a single client would hold in memory.
+_INDEX_TYPECODE = 'L' if array('L').itemsize == 4 else 'I'
+
+# Use a direct-address id index while the largest id is below
+# _MAX_ID_SPARSITY * rows + _MIN_DIRECT_INDEX, otherwise fall back to a dict.
+# Once on the dict, only switch back below _REDENSIFY_SPARSITY * rows, so ids
+# near the threshold do not rebuild the index on every append.
+_MAX_ID_SPARSITY = 4
+_REDENSIFY_SPARSITY = 2
+_MIN_DIRECT_INDEX = 1024
+
+
+def _normalize_id(product_id):
+    """Return a product id as an int, or None if it is not a whole number."""
+    try:
+        return operator.index(product_id)
+    except TypeError:
+        pass
+    try:
+        as_int = int(product_id)
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return as_int if as_int == product_id else None
+
+
+class StringPool:
+    """Store strings once as UTF-8 in a single buffer and refer to them by code."""
+
+    def __init__(self, intern=True):
+        """Create an empty pool; with intern=False duplicate strings are not merged."""
+        self._data = bytearray()
+        self._offsets = array('Q', [0])
+        self._codes = {} if intern else None
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def add(self, value):
+        """Add a string to the pool and return its code."""
+        if self._codes is not None:
+            code = self._codes.get(value)
+            if code is not None:
+                return code
+        code = len(self)
+        self._data += value.encode('utf-8')
+        self._offsets.append(len(self._data))
+        if self._codes is not None:
+            self._codes[value] = code
+        return code
+
+    def code(self, value):
+        """Return the code of an interned string, or None if it is not in the pool."""
+        if self._codes is None:
+            raise TypeError("Code lookup requires an interning pool")
+        return self._codes.get(value)
+
+    def get(self, code):
+        """Return the string stored under a code."""
+        return self._data[self._offsets[code]:self._offsets[code + 1]].decode('utf-8')
+
+    def truncate(self, length):
+        """Drop every string added after the pool held `length` strings."""
+        if length >= len(self):
+            return
+        if self._codes is not None:
+            for code in range(length, len(self)):
+                del self._codes[self.get(code)]
+        del self._data[self._offsets[length]:]
+        del self._offsets[length + 1:]
+
+    def nbytes(self):
+        """Approximate memory held by the pool buffers and intern dict."""
+        total = len(self._data) + self._offsets.itemsize * len(self._offsets)
+        if self._codes is not None:
+            total += sys.getsizeof(self._codes)
+            total += sum(sys.getsizeof(value) for value in self._codes)
+        return total
+
+
+class ProductTable:
+    """Columnar, in-memory copy of the products table.
+
+    Numeric columns live in typed arrays and names/categories in string pools,
+    so a row costs a few dozen bytes instead of a tuple of Python objects.
+    Column accessors return read-only memoryviews over the arrays. An array
+    with a live view cannot grow, so append raises BufferError while one is
+    held and leaves the table unchanged.
+    """
+
+    def __init__(self):
+        """Create an empty table."""
+        self._ids = array('q')
+        self._prices = array('d')
+        self._quantities = array('q')
+        self._name_codes = array(_INDEX_TYPECODE)
+        self._category_codes = array(_INDEX_TYPECODE)
+        self._names = StringPool(intern=False)
+        self._categories = StringPool()
+        # Exactly one id index is in use: the direct-address array
+        # (_row_by_id[product_id] -> row, -1 if absent) or the sparse dict.
+        self._row_by_id = array('q')
+        self._row_by_id_sparse = None
+        self._min_id = None
+        self._max_id = None
+        self._planned_rows = 0
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a table from (id, name, category, price, quantity) rows."""
+        table = cls()
+        rows = list(rows)
+        ids = [_normalize_id(row[0]) for row in rows]
+        if ids and None not in ids:
+            table._reserve_index(min(ids), max(ids), len(ids))
+        for row in rows:
+            table.append(*row[:5])
+        return table
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def append(self, product_id, name, category, price, quantity):
+        """Append one product row; on failure the table is left unchanged."""
+        if int(quantity) != quantity:
+            raise ValueError("Quantity must be a whole number")
+        product_id = _normalize_id(product_id)
+        if product_id is None:
+            raise ValueError("Product id must be a whole number")
+        price = float(price)
+        quantity = int(quantity)
+        if not isinstance(name, str) or not isinstance(category, str):
+            raise TypeError("Product name and category must be strings")
+        if self.get_row_index(product_id) is not None:
+            raise ValueError(f"Duplicate product id {product_id}")
+
+        row = len(self._ids)
+        names_len = len(self._names)
+        categories_len = len(self._categories)
+        columns = (
+            self._ids, self._prices, self._quantities,
+            self._name_codes, self._category_codes,
+        )
+        try:
+            name_code = self._names.add(name)
+            category_code = self._categories.add(category)
+            for column, value in zip(columns, (product_id, price, quantity,
+                                               name_code, category_code)):
+                column.append(value)
+            self._index_id(product_id, row)
+        except BaseException:
+            # Columns that grew have no exported buffers, so they can shrink.
+            for column in columns:
+                if len(column) > row:
+                    del column[row:]
+            self._names.truncate(names_len)
+            self._categories.truncate(categories_len)
+            raise
+
+    def _is_dense(self, min_id, max_id, rows, sparsity=_MAX_ID_SPARSITY):
+        """Whether ids in [min_id, max_id] are dense enough for direct indexing."""
+        rows = max(rows, self._planned_rows)
+        return min_id >= 0 and max_id < sparsity * rows + _MIN_DIRECT_INDEX
+
+    def _reserve_index(self, min_id, max_id, rows):
+        """Size the id index up front for `rows` ids spanning [min_id, max_id]."""
+        self._planned_rows = rows
+        if len(self._ids) == 0 and self._is_dense(min_id, max_id, rows):
+            self._row_by_id = array('q', [-1]) * (max_id + 1)
+
+    def _index_id(self, product_id, row):
+        """Record the row of a newly appended product id in the id index."""
+        min_id = product_id if self._min_id is None else min(self._min_id, product_id)
+        max_id = product_id if self._max_id is None else max(self._max_id, product_id)
+        if self._row_by_id_sparse is None:
+            sparsity = _MAX_ID_SPARSITY
+        else:
+            sparsity = _REDENSIFY_SPARSITY
+        if self._is_dense(min_id, max_id, len(self._ids), sparsity):
+            if self._row_by_id_sparse is not None:
+                logging.info("Product ids dense again, rebuilding direct index")
+                index = array('q', [-1]) * (max_id + 1)
+                for i, pid in enumerate(self._ids):
+                    index[pid] = i
+                self._row_by_id = index
+                self._row_by_id_sparse = None
+            elif product_id >= len(self._row_by_id):
+                grow = max(product_id + 1 - len(self._row_by_id), len(self._row_by_id))
+                self._row_by_id.extend(array('q', [-1]) * grow)
+            self._row_by_id[product_id] = row
+        elif self._row_by_id_sparse is None:
+            logging.info("Product ids too sparse for direct indexing, using a dict")
+            self._row_by_id_sparse = {pid: i for i, pid in enumerate(self._ids)}
+            self._row_by_id = None
+        else:
+            self._row_by_id_sparse[product_id] = row
+        self._min_id = min_id
+        self._max_id = max_id
+
+    def get_row_index(self, product_id):
+        """Return the row holding a product id, or None if it is not present."""
+        product_id = _normalize_id(product_id)
+        if product_id is None:
+            return None
+        if self._row_by_id_sparse is not None:
+            return self._row_by_id_sparse.get(product_id)
+        if 0 <= product_id < len(self._row_by_id):
+            row = self._row_by_id[product_id]
+            if row >= 0:
+                return row
+        return None
+
+    def get(self, product_id):
+        """Return the product row for an id, or None if it is not present."""
+        row = self.get_row_index(product_id)
+        if row is None:
+            return None
+        return self.row(row)
+
+    def row(self, index):
+        """Return a row as an (id, name, category, price, quantity) tuple."""
+        return (
+            self._ids[index],
+            self._names.get(self._name_codes[index]),
+            self._categories.get(self._category_codes[index]),
+            self._prices[index],
+            self._quantities[index],
+        )
+
+    def rows(self, indexes=None):
+        """Yield row tuples, optionally only for the given row indexes."""
+        if indexes is None:
+            indexes = range(len(self))
+        for index in indexes:
+            yield self.row(index)
+
+    def name(self, index):
+        """Return the product name stored in a row."""
+        return self._names.get(self._name_codes[index])
+
+    def category(self, index):
+        """Return the category stored in a row."""
+        return self._categories.get(self._category_codes[index])
+
+    @property
+    def ids(self):
+        """Read-only view of the id column."""
+        return memoryview(self._ids).toreadonly()
+
+    @property
+    def prices(self):
+        """Read-only view of the price column."""
+        return memoryview(self._prices).toreadonly()
+
+    @property
+    def quantities(self):
+        """Read-only view of the quantity column."""
+        return memoryview(self._quantities).toreadonly()
+
+    @property
+    def category_codes(self):
+        """Read-only view of the interned category codes."""
+        return memoryview(self._category_codes).toreadonly()
+
+    def categories(self):
+        """Return the distinct categories, in code order."""
+        return [self._categories.get(code) for code in range(len(self._categories))]
+
+    def filter(self, category=None, min_price=None, max_price=None, in_stock=None):
+        """Return the row indexes matching all given conditions as an array."""
+        result = array(_INDEX_TYPECODE)
+        code = None
+        if category is not None:
+            code = self._categories.code(category)
+            if code is None:
+                return result
+        low = float('-inf') if min_price is None else min_price
+        high = float('inf') if max_price is None else max_price
+        append = result.append
+        rows = zip(self._category_codes, self._prices, self._quantities)
+        for i, (category_code, price, quantity) in enumerate(rows):
+            if code is not None and category_code != code:
+                continue
+            if not low <= price <= high:
+                continue
+            if in_stock is not None and (quantity > 0) != in_stock:
+                continue
+            append(i)
+        return result
+
+    def sort_indexes(self, by='id', reverse=False, indexes=None):
+        """Return row indexes ordered by a column, optionally sorting only a subset."""
+        columns = {
+            'id': self._ids,
+            'price': self._prices,
+            'quantity': self._quantities,
+        }
+        if by in columns:
+            key = columns[by].__getitem__
+        elif by == 'name':
+            key = self.name
+        elif by == 'category':
+            key = self.category
+        else:
+            raise ValueError(f"Cannot sort by unknown column {by!r}")
+        if indexes is None:
+            indexes = range(len(self))
+        return array(_INDEX_TYPECODE, sorted(indexes, key=key, reverse=reverse))
+
+    def take(self, indexes):
+        """Return a new table holding only the given rows, in that order."""
+        table = ProductTable()
+        ids = [self._ids[index] for index in indexes]
+        if ids:
+            table._reserve_index(min(ids), max(ids), len(ids))
+        for index in indexes:
+            table.append(*self.row(index))
+        return table
+
+    def nbytes(self):
+        """Approximate memory held by the table's columns, pools and index."""
+        columns = (
+            self._ids, self._prices, self._quantities,
+            self._name_codes, self._category_codes,
+        )
+        total = sum(col.itemsize * len(col) for col in columns)
+        if self._row_by_id_sparse is not None:
+            total += sys.getsizeof(self._row_by_id_sparse)
+            total += sum(sys.getsizeof(pid) + sys.getsizeof(row)
+                         for pid, row in self._row_by_id_sparse.items())
+        else:
+            total += self._row_by_id.itemsize * len(self._row_by_id)
+        return total + self._names.nbytes() + self._categories.nbytes()
@@ -0,0 +1,62 @@
+import unittest
+
+try:
+    import mysql.connector
+except ImportError:
+    raise unittest.SkipTest("mysql-connector-python is not installed")
+
+from mysql.connector import Error
+from Inventory_management_backend import InventoryManagementSystem
+
+
+class StubCursor:
+    def __init__(self, rows, error=None):
+        self.rows = rows
+        self.error = error
+
+    def execute(self, query, params=()):
+        if self.error:
+            raise self.error
+
+    def fetchall(self):
+        return list(self.rows)
+
+
+class StubConnection:
+    def __init__(self, rows, error=None):
+        self.rows = rows
+        self.error = error
+
+    def cursor(self):
+        return StubCursor(self.rows, self.error)
+
+
+def _backend(connection):
+    # Skip __init__, which connects to the MySQL server.
+    ims = InventoryManagementSystem.__new__(InventoryManagementSystem)
+    ims.connection = connection
+    return ims
+
+
+class ViewInventoryTableTest(unittest.TestCase):
+    def test_loads_products(self):
+        rows = [(1, "Apple", "Fruit", 0.5, 10), (3, "Bread", "Bakery", 2.0, 0)]
+        table = _backend(StubConnection(rows)).view_inventory_table()
+        self.assertEqual(list(table), rows)
+        self.assertEqual(table.get(3), rows[1])
+
+    def test_invalid_row_returns_empty_table(self):
+        rows = [(1, "Apple", "Fruit", 0.5, 10), (2, "Bread", None, 2.0, 0)]
+        table = _backend(StubConnection(rows)).view_inventory_table()
+        self.assertEqual(len(table), 0)
+
+    def test_database_error_returns_empty_table(self):
+        table = _backend(StubConnection([], Error("gone away"))).view_inventory_table()
+        self.assertEqual(len(table), 0)
+
+    def test_no_connection_returns_empty_table(self):
+        self.assertEqual(len(_backend(None).view_inventory_table()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
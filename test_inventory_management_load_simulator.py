@@ -0,0 +1,162 @@
+import logging
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+
+try:
+    import mysql.connector
+except ImportError:
+    raise unittest.SkipTest("mysql-connector-python is not installed")
+
+from mysql.connector import errors
+from Inventory_management_backend import InventoryManagementSystem
+import inventory_management_load_simulator as sim
+
+
+def setUpModule():
+    logging.disable(logging.CRITICAL)
+
+
+def tearDownModule():
+    logging.disable(logging.NOTSET)
+
+
+class TempDbTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.db_path = os.path.join(self.temp_dir.name, "sim.db")
+
+
+class ErrorMappingTest(unittest.TestCase):
+    def test_lock_errors(self):
+        locked = sqlite3.OperationalError("database is locked")
+        self.assertEqual(sim._to_mysql_error(locked).errno, sim.ER_LOCK_WAIT_TIMEOUT)
+        self.assertEqual(sim._to_mysql_error(locked, deadlock=True).errno, sim.ER_LOCK_DEADLOCK)
+        table_locked = sqlite3.OperationalError("database table is locked")
+        self.assertEqual(sim._to_mysql_error(table_locked).errno, sim.ER_LOCK_WAIT_TIMEOUT)
+
+    def test_other_errors(self):
+        integrity = sim._to_mysql_error(sqlite3.IntegrityError("UNIQUE constraint failed"))
+        self.assertIsInstance(integrity, errors.IntegrityError)
+        other = sim._to_mysql_error(sqlite3.OperationalError("no such table: x"), deadlock=True)
+        self.assertIsInstance(other, errors.DatabaseError)
+        self.assertNotIn(other.errno, sim.LOCK_ERRNOS)
+
+
+class PercentileTest(unittest.TestCase):
+    def test_nearest_rank(self):
+        values = [1, 2, 3, 4, 5]
+        self.assertEqual(sim.percentile(values, 50), 3)
+        self.assertEqual(sim.percentile(values, 90), 5)
+        self.assertEqual(sim.percentile(values, 20), 1)
+        self.assertEqual(sim.percentile(values, 0), 1)
+        self.assertEqual(sim.percentile(values, 100), 5)
+        self.assertEqual(sim.percentile(list(range(1, 101)), 99), 99)
+        self.assertEqual(sim.percentile([], 50), 0.0)
+
+
+class StandInConnectionTest(TempDbTestCase):
+    def setUp(self):
+        super().setUp()
+        self.initial_stock = sim.create_standin_db(self.db_path, 3, 5, 1, random.Random(0))
+
+    def test_placeholders_are_rewritten(self):
+        connection = sim.StandInConnection(self.db_path)
+        self.addCleanup(connection.close)
+        cursor = connection.cursor()
+        cursor.execute("SELECT quantity FROM products WHERE id = %s AND quantity >= %s", (2, 1))
+        self.assertEqual(cursor.fetchone(), (5,))
+
+    def test_errors_are_mapped_and_recorded(self):
+        connection = sim.StandInConnection(self.db_path)
+        self.addCleanup(connection.close)
+        with self.assertRaises(errors.DatabaseError):
+            connection.cursor().execute("SELECT * FROM missing")
+        self.assertIsInstance(connection.last_error, errors.DatabaseError)
+
+    def test_lock_error_at_commit_stays_inside_record_sale(self):
+        holder = sqlite3.connect(self.db_path, isolation_level=None)
+        self.addCleanup(holder.close)
+        holder.execute("BEGIN")
+        holder.execute("SELECT * FROM products").fetchall()
+
+        connection = sim.StandInConnection(self.db_path, lock_timeout=0.1)
+        ims = InventoryManagementSystem(connection=connection)
+        self.addCleanup(ims.close_connection)
+        connection.last_error = None
+        self.assertFalse(ims.record_sale("INV-1", 1, 1, 1.0, "SIM-CASHIER-1"))
+        self.assertIn(connection.last_error.errno, sim.LOCK_ERRNOS)
+
+        holder.execute("ROLLBACK")
+        consistency = sim.check_consistency(self.db_path, self.initial_stock)
+        self.assertEqual(consistency["sales_rows"], 0)
+        self.assertEqual(consistency["mismatched_products"], [])
+
+
+class CheckConsistencyTest(TempDbTestCase):
+    def setUp(self):
+        super().setUp()
+        self.initial_stock = sim.create_standin_db(self.db_path, 3, 5, 1, random.Random(0))
+        self.raw = sqlite3.connect(self.db_path)
+        self.addCleanup(self.raw.close)
+
+    def sell(self, product_id, quantity, new_stock):
+        self.raw.execute(
+            "INSERT INTO sales (invoice_number, product_id, quantity, total_price, cashier_username)"
+            " VALUES ('INV', ?, ?, 1.0, 'SIM-CASHIER-1')", (product_id, quantity)
+        )
+        self.raw.execute("UPDATE products SET quantity = ? WHERE id = ?", (new_stock, product_id))
+        self.raw.commit()
+
+    def test_consistent(self):
+        self.sell(1, 2, 3)
+        result = sim.check_consistency(self.db_path, self.initial_stock)
+        self.assertEqual(result["sales_rows"], 1)
+        self.assertEqual(result["units_sold"], 2)
+        self.assertEqual(result["oversold_products"], [])
+        self.assertEqual(result["mismatched_products"], [])
+
+    def test_oversold(self):
+        self.sell(2, 4, 1)
+        self.sell(2, 3, -2)
+        result = sim.check_consistency(self.db_path, self.initial_stock)
+        self.assertEqual(result["oversold_products"], [2])
+        self.assertEqual(result["oversold_units"], 2)
+        self.assertEqual(result["mismatched_products"], [])
+
+    def test_mismatched(self):
+        self.sell(3, 1, 1)
+        result = sim.check_consistency(self.db_path, self.initial_stock)
+        self.assertEqual(result["oversold_products"], [])
+        self.assertEqual(result["mismatched_products"], [3])
+
+
+class RunSimulationTest(TempDbTestCase):
+    def run_once(self, db_name):
+        config = sim.parse_args([
+            "--cashiers", "2", "--baskets", "5", "--products", "10",
+            "--initial-stock", "1000", "--seed", "11",
+        ])
+        config.db_path = os.path.join(self.temp_dir.name, db_name)
+        return sim.run_simulation(config)
+
+    def test_seeded_run(self):
+        report = self.run_once("first.db")
+        self.assertTrue(report["ok"])
+        self.assertEqual(report["cashiers_logged_in"], 2)
+        self.assertEqual(report["crashed_sessions"], {})
+        self.assertEqual(report["baskets"], 10)
+        self.assertGreater(report["sales"], 0)
+        self.assertEqual(report["consistency"]["sales_rows"], report["sales"])
+        self.assertIn("Result:             OK", sim.format_report(report))
+
+        again = self.run_once("second.db")
+        self.assertEqual(again["sales"], report["sales"])
+        self.assertEqual(again["consistency"]["units_sold"], report["consistency"]["units_sold"])
+
+
+if __name__ == '__main__':
+    unittest.main()
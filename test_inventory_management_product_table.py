@@ -0,0 +1,184 @@
+import unittest
+
+from inventory_management_product_table import ProductTable, StringPool
+
+
+def _rows(ids):
+    return [(pid, f"Product {pid}", f"Category {pid % 3}", pid % 7 + 0.5, pid % 4)
+            for pid in ids]
+
+
+class StringPoolTest(unittest.TestCase):
+    def test_interning_merges_duplicates(self):
+        pool = StringPool()
+        self.assertEqual(pool.add("tea"), 0)
+        self.assertEqual(pool.add("café"), 1)
+        self.assertEqual(pool.add("tea"), 0)
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(pool.get(1), "café")
+        self.assertEqual(pool.code("café"), 1)
+        self.assertIsNone(pool.code("milk"))
+
+    def test_non_interning_keeps_duplicates(self):
+        pool = StringPool(intern=False)
+        self.assertEqual([pool.add("a"), pool.add("a")], [0, 1])
+        with self.assertRaises(TypeError):
+            pool.code("a")
+
+    def test_truncate(self):
+        pool = StringPool()
+        pool.add("a")
+        pool.add("b")
+        pool.truncate(1)
+        self.assertEqual(len(pool), 1)
+        self.assertIsNone(pool.code("b"))
+        self.assertEqual(pool.add("c"), 1)
+        self.assertEqual(pool.get(1), "c")
+
+
+class ProductTableIndexTest(unittest.TestCase):
+    def assert_lookups(self, table, rows):
+        self.assertEqual(len(table), len(rows))
+        for row in rows:
+            self.assertEqual(table.get(row[0]), row)
+        self.assertIsNone(table.get(-5))
+        self.assertIsNone(table.get(10 ** 9))
+
+    def test_dense_ids_use_direct_index(self):
+        rows = _rows(range(1, 2001))
+        table = ProductTable.from_rows(rows)
+        self.assert_lookups(table, rows)
+        self.assertIsNone(table._row_by_id_sparse)
+
+    def test_sparse_ids_use_dict(self):
+        rows = _rows([3, 10 ** 7, 5 * 10 ** 8])
+        table = ProductTable.from_rows(rows)
+        self.assert_lookups(table, rows)
+        self.assertIsNotNone(table._row_by_id_sparse)
+        self.assertGreater(table.nbytes(), sum(len(r[1]) for r in rows))
+
+    def test_out_of_order_dense_ids_end_up_direct(self):
+        ids = list(range(1, 20001))
+        ids.reverse()
+        rows = _rows(ids)
+        table = ProductTable.from_rows(rows)
+        self.assert_lookups(table, rows)
+        self.assertIsNone(table._row_by_id_sparse)
+
+    def test_take_of_sorted_subset_keeps_direct_index(self):
+        table = ProductTable.from_rows(_rows(range(1, 5001)))
+        copy = table.take(table.sort_indexes('price'))
+        self.assertIsNone(copy._row_by_id_sparse)
+        self.assertEqual(copy.get(4321), table.get(4321))
+        self.assertEqual(sorted(copy), sorted(table))
+
+    def test_ids_near_threshold_do_not_flip_index(self):
+        ids = []
+        pid = 1028
+        for i in range(8000):
+            pid += 3 if i % 2 else 5
+            ids.append(pid)
+        table = ProductTable()
+        switches = 0
+        sparse = False
+        for row in _rows(ids):
+            table.append(*row)
+            if (table._row_by_id_sparse is not None) != sparse:
+                sparse = not sparse
+                switches += 1
+        self.assertLessEqual(switches, 2)
+        self.assert_lookups(table, _rows(ids))
+
+    def test_bulk_load_chooses_index_once(self):
+        ids = list(range(4, 4 * 20000, 4))
+        table = ProductTable.from_rows(_rows(ids))
+        self.assertIsNone(table._row_by_id_sparse)
+        self.assertEqual(len(table._row_by_id), ids[-1] + 1)
+        sparse = ProductTable.from_rows(_rows(range(10, 10 * 5000, 10)))
+        self.assertIsNotNone(sparse._row_by_id_sparse)
+
+    def test_lookup_normalizes_ids(self):
+        for ids in ([1, 2, 3], [1, 10 ** 9]):
+            table = ProductTable.from_rows(_rows(ids))
+            self.assertEqual(table.get(1.0), table.get(1))
+            self.assertIsNone(table.get(1.5))
+            self.assertIsNone(table.get("1"))
+            self.assertIsNone(table.get(None))
+
+    def test_duplicate_id_rejected(self):
+        table = ProductTable.from_rows(_rows([1]))
+        with self.assertRaises(ValueError):
+            table.append(1, "x", "y", 1.0, 1)
+
+
+class ProductTableAppendTest(unittest.TestCase):
+    def assert_unchanged(self, table, rows, nbytes):
+        self.assertEqual(list(table), rows)
+        self.assertEqual(table.nbytes(), nbytes)
+        self.assertEqual(len(table.prices), len(rows))
+        self.assertEqual(table.categories(), ["Category 1"])
+
+    def test_failed_append_leaves_table_unchanged(self):
+        rows = _rows([1])
+        table = ProductTable.from_rows(rows)
+        nbytes = table.nbytes()
+        bad_rows = [
+            (2, "New", "Category 9", 1.0, None),
+            (2, "New", "Category 9", 1.0, 2.5),
+            (2, None, "Category 9", 1.0, 1),
+            (2, "New", "Category 9", "cheap", 1),
+        ]
+        for bad in bad_rows:
+            with self.assertRaises((TypeError, ValueError)):
+                table.append(*bad)
+            self.assert_unchanged(table, rows, nbytes)
+
+    def test_append_while_view_held_raises_and_rolls_back(self):
+        rows = _rows([1])
+        table = ProductTable.from_rows(rows)
+        nbytes = table.nbytes()
+        for column in ('ids', 'prices', 'quantities', 'category_codes'):
+            view = getattr(table, column)
+            with self.assertRaises(BufferError):
+                table.append(2, "New", "Category 9", 1.0, 1)
+            view.release()
+            self.assert_unchanged(table, rows, nbytes)
+        table.append(2, "New", "Category 9", 1.0, 1)
+        self.assertEqual(table.get(2), (2, "New", "Category 9", 1.0, 1))
+
+
+class ProductTableQueryTest(unittest.TestCase):
+    def setUp(self):
+        self.table = ProductTable.from_rows([
+            (1, "Apple", "Fruit", 0.5, 10),
+            (2, "Bread", "Bakery", 2.0, 0),
+            (3, "Cherry", "Fruit", 4.0, 0),
+            (4, "Donut", "Bakery", 1.5, 3),
+            (5, "Elderberry", "Fruit", 3.0, 7),
+        ])
+
+    def test_filter(self):
+        self.assertEqual(list(self.table.filter(category="Fruit")), [0, 2, 4])
+        self.assertEqual(list(self.table.filter(min_price=1.5, max_price=3.0)), [1, 3, 4])
+        self.assertEqual(list(self.table.filter(in_stock=False)), [1, 2])
+        self.assertEqual(list(self.table.filter(category="Fruit", in_stock=True)), [0, 4])
+        self.assertEqual(list(self.table.filter(category="Dairy")), [])
+        self.assertEqual(list(self.table.filter()), [0, 1, 2, 3, 4])
+
+    def test_sort_indexes(self):
+        self.assertEqual(list(self.table.sort_indexes('price')), [0, 3, 1, 4, 2])
+        self.assertEqual(list(self.table.sort_indexes('name', reverse=True)), [4, 3, 2, 1, 0])
+        fruit = self.table.filter(category="Fruit")
+        self.assertEqual(list(self.table.sort_indexes('quantity', indexes=fruit)), [2, 4, 0])
+        with self.assertRaises(ValueError):
+            self.table.sort_indexes('colour')
+
+    def test_take(self):
+        subset = self.table.take(self.table.sort_indexes('price', reverse=True)[:2])
+        self.assertEqual(list(subset), [(3, "Cherry", "Fruit", 4.0, 0),
+                                        (5, "Elderberry", "Fruit", 3.0, 7)])
+        self.assertEqual(subset.categories(), ["Fruit"])
+
+
+if __name__ == '__main__':
+    unittest.main()